@@ -1,8 +1,8 @@
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from collections import defaultdict
+from functools import lru_cache
 
-from jira import JIRA
 import numpy as np
 
 
@@ -36,56 +36,110 @@ def calculate_initial_story_points(total_stories, stories_without_estimates, sto
     return story_points_for_estimated_stories + extrapolated_points
 
 
-def run_simulation(total_initial_points, simulations, burn_rate, total_stories):
+def _impact_arrays(simulations):
+    """Returns the impact keys with their probabilities and impact multipliers as contiguous float64 arrays."""
+    impact_keys = list(simulations)
+    probabilities = np.fromiter(
+        (simulations[key]['probability'] for key in impact_keys), dtype=np.float64, count=len(impact_keys))
+    impacts = np.fromiter(
+        (simulations[key]['impact'] for key in impact_keys), dtype=np.float64, count=len(impact_keys))
+    return impact_keys, probabilities, impacts
+
+
+def run_simulation(total_initial_points, simulations, burn_rate, total_stories, num_simulations=1, rng=None):
     """
-        Runs a simulation to estimate the total points considering different impacts and calculates the delivery weeks.
+        Runs a batch of simulations to estimate the total points considering different impacts and calculates the delivery weeks.
 
-        This function simulates the impact of different factors on the total story points. For each type of impact,
-        it uses a binomial distribution to determine whether a specific impact event occurs for a story.
-        If the event occurs, the story's points are adjusted based on the defined impact multiplier.
+        This function simulates the impact of different factors on the total story points. For each simulation and each
+        type of impact, it uses a binomial distribution to determine how many stories the impact event occurs for.
+        Each affected story's points are adjusted based on the defined impact multiplier.
         Finally, the function computes the number of delivery weeks required given the adjusted story points and a defined burn rate.
+        All simulations are drawn together in a single (num_impacts, num_simulations) binomial call.
 
         Parameters:
         - total_initial_points (float): The initial total story points before any impact.
         - simulations (dict): A dictionary where each key represents a type of impact, and the associated value is another dictionary with keys 'probability' (probability of the impact event occurring for a story) and 'impact' (multiplier for story points if the event occurs).
         - burn_rate (float): The number of story points that can be delivered per week.
         - total_stories (int): The total number of stories.
+        - num_simulations (int): The number of simulations to run.
+        - rng (np.random.Generator, optional): The random generator to draw from. A fresh default generator is used if omitted.
 
         Returns:
-        - dict: A dictionary with keys representing different types of impacts and their corresponding total adjusted points, 'delivery_weeks' (estimated weeks for delivery) and 'final_points' (total adjusted story points after all impacts).
+        - dict: A dictionary with keys representing different types of impacts and their corresponding total adjusted points, 'delivery_weeks' (estimated weeks for delivery) and 'final_points' (total adjusted story points after all impacts). Each value is an array with one entry per simulation.
 
         Example:
         simulations_data = {
             'type1': {'probability': 0.1, 'impact': 0.2},
             'type2': {'probability': 0.05, 'impact': 0.5}
         }
-        run_simulation(1000, simulations_data, 50, 100)
-        {'type1': ..., 'type2': ..., 'delivery_weeks': ..., 'final_points': ...}
+        run_simulation(1000, simulations_data, 50, 100, 1000)
+        {'type1': array([...]), 'type2': array([...]), 'delivery_weeks': array([...]), 'final_points': array([...])}
 
         Notes:
         - The function assumes a binomial distribution for the occurrence of impact events for stories.
         - Ensure the 'probability' values in simulations are between 0 and 1, and the 'impact' values are non-negative.
         """
     avg_story_size = total_initial_points / total_stories
-    simulation_results = {}
+    impact_keys, probabilities, impacts = _impact_arrays(simulations)
+
+    # The number of stories hit by an impact is the sum of total_stories Bernoulli trials,
+    # i.e. one Binomial(total_stories, probability) draw. Each impact gets its own row so consecutive
+    # draws share (n, p) and NumPy reuses the sampler setup instead of recomputing it for every draw.
+    if rng is None:
+        rng = np.random.default_rng()
+    events = rng.binomial(total_stories, probabilities[:, np.newaxis], size=(len(impact_keys), num_simulations))
+
+    # Scale the (num_impacts,) multipliers first so only one (num_impacts, num_simulations) array is allocated,
+    # then accumulate the totals in place. float32 is ample for the sampling noise of a Monte Carlo run
+    # and halves the memory traffic of the reductions over the results.
+    impact_points = np.multiply(events, (impacts * avg_story_size)[:, np.newaxis], dtype=np.float32)
+    adjusted_points = impact_points.sum(axis=0)
+    adjusted_points += total_initial_points
+
+    simulation_results = {key: impact_points[i] for i, key in enumerate(impact_keys)}
+    simulation_results['delivery_weeks'] = adjusted_points * (1.0 / burn_rate)
+    simulation_results['final_points'] = adjusted_points
+    return simulation_results
 
-    adjusted_points = total_initial_points
-    # For each type of impact
-    for impact_key, simulation_data in simulations.items():
-        total_impact_points = 0
 
-        # Simulating for each story individually
-        for _ in range(total_stories):
-            event = np.random.binomial(1, simulation_data['probability'])
-            impact_points = event * simulation_data['impact'] * avg_story_size
-            total_impact_points += impact_points
+def run_aggregate_simulation(total_initial_points, simulations, burn_rate, total_stories, num_simulations=1, rng=None):
+    """
+        Runs a batch of simulations that only estimates the final points and delivery weeks, without a per-impact breakdown.
 
-        adjusted_points += total_impact_points
-        simulation_results[impact_key] = total_impact_points
+        The adjusted points are the initial points plus a weighted sum of independent binomial impact counts. For a
+        realistic number of stories that sum is well approximated by a normal distribution with the same mean and
+        variance, so each simulation needs a single normal draw instead of one binomial draw per impact.
 
-    simulation_results['delivery_weeks'] = adjusted_points / burn_rate
-    simulation_results['final_points'] = adjusted_points
-    return simulation_results
+        Parameters:
+        - total_initial_points (float): The initial total story points before any impact.
+        - simulations (dict): A dictionary where each key represents a type of impact, and the associated value is another dictionary with keys 'probability' (probability of the impact event occurring for a story) and 'impact' (multiplier for story points if the event occurs).
+        - burn_rate (float): The number of story points that can be delivered per week.
+        - total_stories (int): The total number of stories.
+        - num_simulations (int): The number of simulations to run.
+        - rng (np.random.Generator, optional): The random generator to draw from. A fresh default generator is used if omitted.
+
+        Returns:
+        - dict: A dictionary with keys 'delivery_weeks' and 'final_points', each an array with one entry per simulation.
+
+        Notes:
+        - Use run_simulation when the contribution of each impact is needed, or when total_stories is small enough
+          that the normal approximation is poor.
+        """
+    avg_story_size = total_initial_points / total_stories
+    _, probabilities, impacts = _impact_arrays(simulations)
+    impact_sizes = impacts * avg_story_size
+
+    mean = total_initial_points + total_stories * (probabilities * impact_sizes).sum()
+    variance = total_stories * (probabilities * (1 - probabilities) * impact_sizes ** 2).sum()
+
+    if rng is None:
+        rng = np.random.default_rng()
+    adjusted_points = rng.normal(mean, np.sqrt(variance), size=num_simulations)
+
+    return {
+        'delivery_weeks': adjusted_points * (1.0 / burn_rate),
+        'final_points': adjusted_points
+    }
 
 
 def monte_carlo_simulation(
@@ -94,7 +148,10 @@ def monte_carlo_simulation(
         stories_without_estimates,
         story_points_for_estimated_stories,
         num_simulations,
-        simulations
+        simulations,
+        seed=None,
+        aggregate_only=False,
+        rng=None
 ):
     """
         Conducts a Monte Carlo simulation to estimate delivery weeks and total points based on various impacts.
@@ -109,9 +166,12 @@ def monte_carlo_simulation(
         - story_points_for_estimated_stories (float): The total story points for stories that have been estimated.
         - num_simulations (int): The number of simulations to run.
         - simulations (dict): A dictionary where each key represents a type of impact, and the associated value is another dictionary with keys 'probability' (probability of the impact event occurring for a story) and 'impact' (multiplier for story points if the event occurs).
+        - seed (int, optional): Seed for the random generator, for reproducible results. Fresh entropy is used if omitted.
+        - aggregate_only (bool): If True, only 'delivery_weeks' and 'final_points' are simulated, using the faster normal approximation in run_aggregate_simulation.
+        - rng (np.random.Generator, optional): An existing random generator to draw from, so several runs can share one stream. Takes precedence over seed.
 
         Returns:
-        - tuple: A tuple where the first element is a list containing the result of each simulation, and the second element is a dictionary aggregating the results (average 'delivery_weeks', 'final_points', 'total_initial_points' and 'extrapolated_points').
+        - tuple: A tuple where the first element is a dictionary mapping each result key to an array holding its value for every simulation, and the second element is a dictionary aggregating the results (average 'delivery_weeks', 'final_points', 'total_initial_points' and 'extrapolated_points').
 
         Example:
         simulations_data = {
@@ -119,7 +179,7 @@ def monte_carlo_simulation(
             'type2': {'probability': 0.05, 'impact': 0.5}
         }
         monte_carlo_simulation(50, 100, 50, 500, 1000, simulations_data)
-        ([...], {'delivery_weeks': ..., 'final_points': ..., 'total_initial_points': ..., 'extrapolated_points': ...})
+        ({'type1': array([...]), ...}, {'delivery_weeks': ..., 'final_points': ..., 'total_initial_points': ..., 'extrapolated_points': ...})
 
         Notes:
         - The function leverages the Monte Carlo method which involves running the simulation multiple times to estimate the outcomes.
@@ -129,29 +189,36 @@ def monte_carlo_simulation(
     total_initial_points = calculate_initial_story_points(
         total_stories, stories_without_estimates, story_points_for_estimated_stories)
 
-    all_sim_results = [
-        run_simulation(
-            total_initial_points,
-            simulations,
-            burn_rate,
-            total_stories
-        ) for _ in range(num_simulations)
-    ]
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    simulate = run_aggregate_simulation if aggregate_only else run_simulation
+    all_sim_results = simulate(
+        total_initial_points,
+        simulations,
+        burn_rate,
+        total_stories,
+        num_simulations,
+        rng
+    )
 
     aggregated_data = {
-        'delivery_weeks': np.mean([sim['delivery_weeks'] for sim in all_sim_results]),
+        'delivery_weeks': all_sim_results['delivery_weeks'].mean(),
         'total_stories': total_stories,
         'total_initial_points': total_initial_points,
         'extrapolated_points': total_initial_points - story_points_for_estimated_stories,
-        'final_points': np.mean([sim['final_points'] for sim in all_sim_results])
+        'final_points': all_sim_results['final_points'].mean()
     }
 
     return all_sim_results, aggregated_data
 
 
+# Monday to Friday working week, built once and shared by every delivery date calculation
+_BUSINESS_DAYS = np.busdaycalendar()
+
+
 def get_delivery_date(start_date, delivery_weeks):
     business_days = delivery_weeks * 5
-    delivery_date = np.busday_offset(start_date, business_days, roll='forward')
+    delivery_date = np.busday_offset(start_date, business_days, roll='forward', busdaycal=_BUSINESS_DAYS)
     return str(delivery_date)
 
 
@@ -160,12 +227,12 @@ def print_results(version_name, start_date, end_date, simulation_results, aggreg
     print(version_name)
     print('---------------------------------------------------')
     print("Simulation Results:")
-    sorted_keys = sorted(simulation_results[0], key=lambda k: -np.mean([sim[k] for sim in simulation_results]))
+    stats = {key: (values.mean(), values.std()) for key, values in simulation_results.items()}
+    sorted_keys = sorted(stats, key=lambda k: -stats[k][0])
 
     for key in sorted_keys:
-        values = [sim[key] for sim in simulation_results]
-        print(
-            f"\t{key.replace('_', ' ').capitalize()}: Mean = {np.mean(values):.2f}, Std = {np.std(values):.2f}")
+        mean, std = stats[key]
+        print(f"\t{key.replace('_', ' ').capitalize()}: Mean = {mean:.2f}, Std = {std:.2f}")
 
     print("\nAggregated Data:")
     for key, value in aggregated_data.items():
@@ -174,52 +241,59 @@ def print_results(version_name, start_date, end_date, simulation_results, aggreg
     print(f"\nTimeline\n\tStart date: {start_date}\n\tDelivery date: {end_date}")
 
 
-def calculate_bottleneck_probability(issues_list):
-    assignee_distribution = defaultdict(int)
-    assignee_story_points = defaultdict(int)
+def calculate_bottleneck_probability(assignees, all_story_points):
+    is_assigned = np.array([assignee is not None for assignee in assignees], dtype=bool)
 
-    for issue in issues_list:
-        if getattr(issue.fields.assignee, 'emailAddress', None) is not None:
-            assignee_distribution[issue.fields.assignee.emailAddress] += 1
-            assignee_story_points[issue.fields.assignee.emailAddress] += issue.fields.customfield_10026
+    # Map each assigned story to an integer engineer id so per-engineer totals are single bincount passes
+    _, engineer_ids = np.unique([assignee for assignee in assignees if assignee is not None], return_inverse=True)
 
-    task_counts = list(assignee_distribution.values())
-    variance = np.var(task_counts)
+    # No assigned stories, or no estimated points, means no bottleneck. This only keeps the bottleneck
+    # figures finite; releases with no stories at all are skipped by main() before simulating.
+    average_issue_size = all_story_points.mean() if all_story_points.size else 0
+    if engineer_ids.size == 0 or average_issue_size == 0:
+        return 0, 0
+
+    task_counts = np.bincount(engineer_ids)
+    assignee_story_points = np.bincount(engineer_ids, weights=all_story_points[is_assigned])
+
+    variance = task_counts.var()
 
     max_variance = 500
     probability = min(1, (variance / max_variance))
 
-    effective_story_points = {
-        engineer: assignee_distribution[engineer] * points for engineer, points in assignee_story_points.items()
-    }
-    average_effective_story_points = sum(effective_story_points.values()) / len(effective_story_points)
-    relative_impacts = [abs(points - average_effective_story_points) for points in effective_story_points.values()]
-    average_impact = sum(relative_impacts) / len(relative_impacts)
+    effective_story_points = task_counts * assignee_story_points
+    average_impact = np.abs(effective_story_points - effective_story_points.mean()).mean()
 
-    all_story_points = [issue.fields.customfield_10026 for issue in issues_list]
-    average_issue_size = sum(all_story_points) / len(all_story_points)
     relative_impact = average_impact / average_issue_size
 
     return probability, relative_impact
 
 
 def format_date(date_string):
-    date_format = '%Y-%m-%d'
     try:
-        return datetime.strptime(date_string, date_format).strftime(date_format)
+        return date.fromisoformat(date_string).isoformat()
     except (TypeError, ValueError):
         return None
 
 
-def get_releases_from_jira(jira_url, project_key):
+@lru_cache(maxsize=1)
+def _get_jira_client(jira_url):
     api_key = os.environ.get('JIRA_ACCESS_TOKEN')
     user_name = os.environ.get('JIRA_USER_NAME')
 
     if not api_key or not user_name:
         raise ValueError("Required environment variables not set.")
 
+    # Imported here so simulation-only use does not pay for the Jira HTTP stack
+    from jira import JIRA
+
+    # The client keeps its authenticated session, so it is built once and reused for every request
     options = {"server": jira_url}
-    jira = JIRA(options, basic_auth=(user_name, api_key))
+    return JIRA(options, basic_auth=(user_name, api_key))
+
+
+def get_releases_from_jira(jira_url, project_key):
+    jira = _get_jira_client(jira_url)
 
     versions = jira.project_versions(project_key)
     releases = []
@@ -236,22 +310,35 @@ def get_releases_from_jira(jira_url, project_key):
     return releases
 
 
-def fetch_and_analyze_stories(jira_url, jql_query):
-    api_key = os.environ.get('JIRA_ACCESS_TOKEN')
-    user_name = os.environ.get('JIRA_USER_NAME')
+def fetch_stories_by_fix_version(jira_url, jql_query):
+    jira = _get_jira_client(jira_url)
+    # One query covers every release, so page through all matches rather than stopping at a fixed count
+    issues = jira.search_issues(jql_query, maxResults=False, fields='assignee,customfield_10026,fixVersions')
 
-    if not api_key or not user_name:
-        raise ValueError("Required environment variables not set.")
+    stories_by_version = defaultdict(list)
+    for issue in issues:
+        for version in issue.fields.fixVersions:
+            stories_by_version[version.name].append(issue)
 
-    options = {"server": jira_url}
-    jira = JIRA(options, basic_auth=(user_name, api_key))
-    issues = jira.search_issues(jql_query, maxResults=1000)
+    return stories_by_version
 
-    story_total = len(issues)
-    story_points_estimated_total = sum(
-        [issue.fields.customfield_10026 for issue in issues if issue.fields.customfield_10026])
-    stories_without_estimates = sum(1 for issue in issues if not getattr(issue.fields, 'customfield_10026', None))
-    bottleneck_probability = calculate_bottleneck_probability(issues)
+
+def analyze_stories(issues):
+    # Read each issue's fields once; everything below works on the extracted values
+    assignees = []
+    story_points = []
+    stories_without_estimates = 0
+    for issue in issues:
+        assignees.append(getattr(issue.fields.assignee, 'emailAddress', None))
+        points = getattr(issue.fields, 'customfield_10026', None)
+        story_points.append(points or 0)
+        if not points:
+            stories_without_estimates += 1
+
+    story_points = np.array(story_points, dtype=np.float64)
+    story_total = len(story_points)
+    story_points_estimated_total = story_points.sum()
+    bottleneck_probability = calculate_bottleneck_probability(assignees, story_points)
 
     return {
         'story_total': story_total,
@@ -262,20 +349,21 @@ def fetch_and_analyze_stories(jira_url, jql_query):
 
 
 def construct_jql_query(project, status_not_in, component_not_in, fix_version_in, sprint=None):
-    jql = f'project = "{project}"'
-    status_exclusions = ', '.join([f'"{status}"' for status in status_not_in])
-    jql += f' AND status not in ({status_exclusions})'
-
-    component_exclusions = ', '.join([f'"{component}"' for component in component_not_in])
-    jql += f' AND (component not in ({component_exclusions}) OR component is EMPTY)'
-
-    fix_versions = ', '.join([f'"{version}"' for version in fix_version_in])
-    jql += f' AND fixVersion in ({fix_versions})'
+    status_exclusions = ', '.join(f'"{status}"' for status in status_not_in)
+    component_exclusions = ', '.join(f'"{component}"' for component in component_not_in)
+    fix_versions = ', '.join(f'"{version}"' for version in fix_version_in)
+
+    clauses = [
+        f'project = "{project}"',
+        f'status not in ({status_exclusions})',
+        f'(component not in ({component_exclusions}) OR component is EMPTY)',
+        f'fixVersion in ({fix_versions})'
+    ]
 
     if sprint:
-        jql += f' AND Sprint = {sprint}'
+        clauses.append(f'Sprint = {sprint}')
 
-    return jql
+    return ' AND '.join(clauses)
 
 
 def main():
@@ -284,6 +372,7 @@ def main():
 
     burn_rate = 320
     simulation_count = 10000
+    rng = np.random.default_rng()
 
     simulations = {
         'estimation_errors': {
@@ -474,20 +563,28 @@ def main():
     unreleased = [r for r in sorted(releases,key=lambda r: r['Name']) if not r['Status']]
     start_date = unreleased[0]['Start Date']
     current = True
+
+    jql_query = construct_jql_query(
+        project=project,
+        status_not_in=["Done", "Abandoned", "Ready for Production", "Verify"],
+        component_not_in=["Parent"],
+        fix_version_in=[release['Name'] for release in unreleased]  # fetch every unreleased version at once
+    )
+
+    stories_by_version = fetch_stories_by_fix_version(
+        jira_url=jira_url,
+        jql_query=jql_query
+    )
+
     for release in unreleased:
-        jql_query = construct_jql_query(
-            project=project,
-            status_not_in=["Done", "Abandoned", "Ready for Production", "Verify"],
-            component_not_in=["Parent"],
-            fix_version_in=[release['Name']]  # use current release version
-        )
-
-        jira_data = fetch_and_analyze_stories(
-            jira_url=jira_url,
-            jql_query=jql_query
-        )
+        jira_data = analyze_stories(stories_by_version.get(release['Name'], []))
 
         story_total = jira_data['story_total']
+        if story_total == 0:
+            # Nothing to forecast; the next release keeps the current start date
+            print(f"\n{release['Name']}: no open stories, skipping forecast")
+            continue
+
         stories_without_estimates = jira_data['stories_without_estimates']
         story_points_estimated_total = jira_data['story_points_estimated_total']
         bottleneck_probability, bottleneck_impact = jira_data['bottleneck_probability']
@@ -496,7 +593,7 @@ def main():
 
         sim_results, agg_data = monte_carlo_simulation(
             burn_rate, story_total, stories_without_estimates,
-            story_points_estimated_total, simulation_count, simulations)
+            story_points_estimated_total, simulation_count, simulations, rng=rng)
 
         if current:
             forecasted_end_date = get_delivery_date(datetime.today().date(), agg_data['delivery_weeks'])